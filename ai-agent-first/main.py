@@ -18,15 +18,23 @@ Why llama3.1?
 """
 
 from __future__ import annotations
+from collections import OrderedDict, deque
 from dataclasses import dataclass, asdict
 from typing import Callable, Dict, Any, List, Optional, Tuple
+import ast
+import atexit
+import hashlib
 import json
 import math
+import operator
+import re
+import shelve
 import time
 import traceback
 import concurrent.futures
 import os
-from datetime import datetime
+
+import numpy as np
 
 # -------------------------------
 # OBSERVABILITY (logs + tracing)
@@ -40,6 +48,21 @@ except Exception:
     logger = logging.getLogger("agent")
     LOGURU = False
 
+# orjson serializes/parses several times faster than stdlib json; fall back
+# transparently when it isn't installed (pip install orjson).
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _json_loads = orjson.loads
+except Exception:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    _json_loads = json.loads
+
 TRACE_JSONL_PATH = "agent_trace.jsonl"
 HUMAN_LOG_PATH = "agent.log"
 
@@ -56,15 +79,47 @@ def _setup_logging():
 
 _setup_logging()
 
+# Wall-clock anchor captured once; per-event timestamps are the anchor plus
+# a monotonic delta, avoiding a datetime construction + isoformat per row
+# and staying immune to clock steps mid-run.
+_TRACE_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+# Trace rows are buffered and appended in batches through a file descriptor
+# opened once per process: O_APPEND keeps concurrent appends atomic and
+# writev lands a whole batch in a single syscall.
+_TRACE_BUFFER: List[bytes] = []
+_TRACE_FLUSH_EVERY = 32
+_TRACE_FD: Optional[int] = None
+
+def _trace_fd() -> int:
+    global _TRACE_FD
+    if _TRACE_FD is None:
+        _TRACE_FD = os.open(TRACE_JSONL_PATH, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    return _TRACE_FD
+
+def flush_trace():
+    """Write any buffered trace rows to disk. Registered atexit."""
+    if not _TRACE_BUFFER:
+        return
+    fd = _trace_fd()
+    if hasattr(os, "writev"):
+        os.writev(fd, _TRACE_BUFFER)
+    else:  # Windows has no writev
+        os.write(fd, b"".join(_TRACE_BUFFER))
+    _TRACE_BUFFER.clear()
+
+atexit.register(flush_trace)
+
 def trace_event(event: str, payload: Dict[str, Any]):
     """Append a structured trace row (JSONL)."""
     row = {
-        "ts": datetime.utcnow().isoformat() + "Z",
+        "ts_ns": _TRACE_EPOCH_NS + time.monotonic_ns(),
         "event": event,
         "payload": payload,
     }
-    with open(TRACE_JSONL_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    _TRACE_BUFFER.append((_json_dumps(row) + "\n").encode("utf-8"))
+    if len(_TRACE_BUFFER) >= _TRACE_FLUSH_EVERY:
+        flush_trace()
     if LOGURU:
         logger.bind(event=event).info(payload)
     else:
@@ -79,19 +134,64 @@ class Tool:
     description: str
     fn: Callable[[str, Dict[str, Any]], str]
 
+# Resolved once at import; rebuilding via dir(math) on every call is wasted work.
+_CALC_ALLOWED_NAMES = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
+
+# Whitelist of AST node types for arithmetic + math.<fn> calls. Anything
+# outside this set (attribute access, subscripts, lambdas, ...) is rejected
+# before evaluation, which replaces the old substring blocklist guard.
+_CALC_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv,
+    ast.Mod, ast.Pow, ast.USub, ast.UAdd, ast.Tuple,
+)
+
+def _check_calc_ast(tree: ast.Expression) -> Optional[str]:
+    """Return a reason string if the expression uses anything non-arithmetic."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALC_ALLOWED_NODES):
+            return f"disallowed syntax: {type(node).__name__}"
+        if isinstance(node, ast.Name) and node.id not in _CALC_ALLOWED_NAMES:
+            return f"unknown name: {node.id}"
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            return "only direct math function calls are allowed"
+    return None
+
+# Single binary operations dispatch straight through operator, skipping
+# the parse/compile/eval pipeline for the most common calculator inputs.
+_SIMPLE_EXPR_RE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*(\*\*|[+\-*/%])\s*(-?\d+(?:\.\d+)?)$")
+_SIMPLE_OPS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "%": operator.mod, "**": operator.pow,
+}
+
+def _num(tok: str):
+    return float(tok) if "." in tok else int(tok)
+
 def calculator_tool(input_text: str, context: Dict[str, Any]) -> str:
     """
     Safe-ish arithmetic only: + - * / ** ( ) and math.<fn>.
     Example: 'sqrt(2)**2 + 13/5'
     """
-    allowed_names = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
-    allowed_names.update({"__builtins__": {}})
     expr = input_text.strip()
-    # very basic guard to avoid sneaky identifiers
-    if any(tok in expr for tok in ["__", "import", "open(", "exec", "eval", "os.", "sys."]):
-        return "Calculator error: disallowed token."
+    m = _SIMPLE_EXPR_RE.match(expr)
+    # '**' binds tighter than unary minus (-5**2 == -(5**2)), so a signed
+    # base falls through to the AST path rather than computing (-5)**2
+    if m and not (m.group(2) == "**" and m.group(1).startswith("-")):
+        a, op, b = m.groups()
+        try:
+            return str(_SIMPLE_OPS[op](_num(a), _num(b)))
+        except Exception as e:
+            return f"Calculator error: {e}"
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        return f"Calculator error: {e}"
+    problem = _check_calc_ast(tree)
+    if problem:
+        return f"Calculator error: {problem}."
     try:
-        result = eval(expr, allowed_names, {})
+        result = eval(compile(tree, "<calc>", "eval"), {"__builtins__": {}}, _CALC_ALLOWED_NAMES)
         return str(result)
     except Exception as e:
         return f"Calculator error: {e}"
@@ -125,7 +225,7 @@ def todo_tool(input_text: str, context: Dict[str, Any]) -> str:
     Simple todos:
       'add: buy milk' | 'list' | 'clear'
     """
-    todos: List[str] = context["memory"].setdefault("todos", [])
+    todos: deque = context["memory"].setdefault("todos", deque())
     cmd = input_text.strip().lower()
     if cmd.startswith("add:"):
         item = input_text.split(":", 1)[1].strip()
@@ -146,6 +246,11 @@ TOOLS: Dict[str, Tool] = {
     "todo":       Tool("todo",       "Manage a simple todo list",   todo_tool),
 }
 
+def _new_memory() -> Dict[str, Any]:
+    """Agent memory with its full layout preallocated, so the tools'
+    setdefault calls never allocate and todos get deque's O(1) ends."""
+    return {"facts": {}, "todos": deque()}
+
 # -------------------------------
 # GUARDRAILS (clearly delineated)
 # -------------------------------
@@ -164,6 +269,9 @@ class Guardrails:
         "rm -rf", "shutdown", "format c:", "powershell -command Stop-Computer",
         "DROP TABLE", "TRUNCATE TABLE",
     ]
+    # Compiled once: a single case-insensitive alternation scans the input
+    # in one pass instead of one .lower() + substring scan per entry.
+    _BLOCKLIST_RE = re.compile("|".join(re.escape(b) for b in BLOCKLIST), re.IGNORECASE)
 
     # Tool execution timeouts (seconds)
     TOOL_TIMEOUT_SECS = {
@@ -172,6 +280,11 @@ class Guardrails:
         "todo": 2,
     }
 
+    # Pure in-process dict/list tools cannot hang, so they skip the
+    # executor round-trip (a submit + context switch per call). The
+    # calculator keeps its timeout: eval of e.g. 9**9**9 can spin.
+    INLINE_TOOLS = {"memory", "todo"}
+
     # LLM output schema (very small validator)
     @staticmethod
     def validate_plan(plan: Dict[str, Any]) -> Tuple[bool, str]:
@@ -180,36 +293,90 @@ class Guardrails:
           {"action": "final", "answer": "<text>", "reason": "<optional>"}
         OR
           {"action": "tool", "tool": "<name>", "input": "<text>", "reason": "<optional>"}
+        OR
+          {"action": "tools", "calls": [{"tool": "<name>", "input": "<text>"}, ...]}
         """
         if not isinstance(plan, dict):
             return False, "Plan must be a JSON object."
-        if "action" not in plan:
-            return False, "Missing 'action'."
-        action = plan["action"]
-        if action not in ("final", "tool"):
-            return False, "Invalid 'action' value."
+        # Single lookup, branches ordered by frequency: tool plans dominate
+        # multi-step runs, so they dispatch on the first comparison.
+        action = plan.get("action")
+        if action == "tool":
+            return Guardrails._validate_tool_call(plan)
         if action == "final":
             if "answer" not in plan or not isinstance(plan["answer"], str):
                 return False, "Final plan must include string 'answer'."
-        if action == "tool":
-            if "tool" not in plan or plan["tool"] not in Guardrails.ALLOWED_TOOLS:
-                return False, f"'tool' must be one of {sorted(Guardrails.ALLOWED_TOOLS)}."
-            if "input" not in plan or not isinstance(plan["input"], str):
-                return False, "Tool plan must include string 'input'."
-            if len(plan["input"]) > Guardrails.MAX_TOOL_INPUT_CHARS:
-                return False, f"Tool input too long (> {Guardrails.MAX_TOOL_INPUT_CHARS} chars)."
-            for bad in Guardrails.BLOCKLIST:
-                if bad.lower() in plan["input"].lower():
-                    return False, f"Blocked content detected: {bad!r}"
+            return True, ""
+        if action == "tools":
+            calls = plan.get("calls")
+            if not isinstance(calls, list) or not calls:
+                return False, "Batch plan must include a non-empty 'calls' list."
+            for call in calls:
+                if not isinstance(call, dict):
+                    return False, "Each batch call must be an object."
+                ok, why = Guardrails._validate_tool_call(call)
+                if not ok:
+                    return False, why
+            return True, ""
+        if action is None:
+            return False, "Missing 'action'."
+        return False, "Invalid 'action' value."
+
+    @staticmethod
+    def _validate_tool_call(call: Dict[str, Any]) -> Tuple[bool, str]:
+        """Validate a single {'tool': ..., 'input': ...} call."""
+        if "tool" not in call or call["tool"] not in Guardrails.ALLOWED_TOOLS:
+            return False, f"'tool' must be one of {sorted(Guardrails.ALLOWED_TOOLS)}."
+        if "input" not in call or not isinstance(call["input"], str):
+            return False, "Tool plan must include string 'input'."
+        if len(call["input"]) > Guardrails.MAX_TOOL_INPUT_CHARS:
+            return False, f"Tool input too long (> {Guardrails.MAX_TOOL_INPUT_CHARS} chars)."
+        hit = Guardrails._BLOCKLIST_RE.search(call["input"])
+        if hit:
+            return False, f"Blocked content detected: {hit.group(0)!r}"
         return True, ""
 
+    # Shared worker pool for tool execution: spawning a fresh
+    # ThreadPoolExecutor per call costs a thread start/join every step.
+    _EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @classmethod
+    def _executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        if cls._EXECUTOR is None:
+            cls._EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="tool"
+            )
+        return cls._EXECUTOR
+
     @staticmethod
     def with_timeout(tool: Tool, tool_input: str, context: Dict[str, Any]) -> str:
         """Run a tool with a timeout to prevent hangs."""
+        if tool.name in Guardrails.INLINE_TOOLS:
+            return tool.fn(tool_input, context)
         timeout = Guardrails.TOOL_TIMEOUT_SECS.get(tool.name, 3)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-            fut = ex.submit(tool.fn, tool_input, context)
-            return fut.result(timeout=timeout)
+        fut = Guardrails._executor().submit(tool.fn, tool_input, context)
+        return fut.result(timeout=timeout)
+
+    @staticmethod
+    def run_parallel(calls: List[Dict[str, str]], context: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """
+        Fan out independent tool calls onto the shared pool, then gather.
+        Returns [(tool_name, result-or-error), ...] in call order.
+        """
+        futs = [
+            (c["tool"], Guardrails._executor().submit(TOOLS[c["tool"]].fn, c["input"], context))
+            for c in calls
+        ]
+        results: List[Tuple[str, str]] = []
+        for name, fut in futs:
+            timeout = Guardrails.TOOL_TIMEOUT_SECS.get(name, 3)
+            try:
+                results.append((name, fut.result(timeout=timeout)))
+            except concurrent.futures.TimeoutError:
+                results.append((name, f"Tool '{name}' timed out."))
+            except Exception as e:
+                results.append((name, f"Tool '{name}' failed: {e}"))
+        return results
 
 # -------------------------------
 # LLM POLICY via OLLAMA
@@ -220,72 +387,230 @@ try:
 except Exception:
     OllamaClient = None
 
+# One client per host per process: each Client owns an httpx connection
+# pool, so sharing it keeps TCP connections warm across policies.
+_OLLAMA_CLIENTS: Dict[str, Any] = {}
+
+def _get_ollama_client(host: str):
+    client = _OLLAMA_CLIENTS.get(host)
+    if client is None:
+        client = _OLLAMA_CLIENTS[host] = OllamaClient(host=host)
+    return client
+
+# Built once at import: a byte-identical prompt prefix across calls lets
+# Ollama reuse its KV-cache for the system+fewshot tokens instead of
+# re-processing them on every plan() call.
+TOOL_DESC = "\n".join(f"- {t.name}: {t.description}" for t in TOOLS.values())
+
+SYSTEM_PROMPT = (
+    "You are a tool-using agent. You must respond ONLY with a single JSON object.\n"
+    "You have these tools:\n"
+    f"{TOOL_DESC}\n\n"
+    "Respond with one of these shapes:\n"
+    '{"action":"tool","tool":"<one of the tools>","input":"<string>","reason":"<short>"}\n'
+    'OR {"action":"final","answer":"<string>","reason":"<short>"}\n'
+    "For several INDEPENDENT tool calls at once, use:\n"
+    '{"action":"tools","calls":[{"tool":"<name>","input":"<string>"}, ...],"reason":"<short>"}\n'
+    "Never include markdown, commentary, or extra text—JSON only.\n"
+)
+
+FEWSHOT: List[Dict[str, str]] = [
+    {
+        "role": "user",
+        "content": "calc: sqrt(2)**2 + 3",
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({"action": "tool", "tool": "calculator", "input": "sqrt(2)**2 + 3", "reason": "User asked to compute."})
+    },
+    {
+        "role": "user",
+        "content": "remember: snack=banana",
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({"action": "tool", "tool": "memory", "input": "remember: snack=banana", "reason": "Store a fact."})
+    },
+    {
+        "role": "user",
+        "content": "What can you do?",
+    },
+    {
+        "role": "assistant",
+        "content": json.dumps({"action": "final", "answer": "I can use calculator/memory/todo tools. Try 'calc: 2+2' or 'todo: add: buy milk'.", "reason": "General answer"})
+    },
+]
+
+# Message prefix assembled once: plan() only appends the user turn instead of
+# rebuilding the system+fewshot list per call. The pre-serialized bytes feed
+# cache keys so the static part is never re-dumped with json.
+BASE_MSGS: List[Dict[str, str]] = [{"role": "system", "content": SYSTEM_PROMPT}, *FEWSHOT]
+_PROMPT_PREFIX_BYTES = json.dumps(BASE_MSGS, sort_keys=True).encode("utf-8")
+
 class LLMPolicy:
     """
     Uses Ollama to produce a strict JSON plan.
     Model: 'llama3.1'
     """
-    def __init__(self, model: str = "llama3.1", host: str = "http://localhost:11434"):
+    def __init__(self, model: str = "llama3.1", host: str = "http://localhost:11434",
+                 cache_maxsize: int = 512, cache_db_path: Optional[str] = None,
+                 embed_model: str = "nomic-embed-text",
+                 semantic_threshold: float = 0.97, semantic_maxsize: int = 256):
         if OllamaClient is None:
             raise RuntimeError("Missing 'ollama' package. Install with: pip install ollama")
-        self.client = OllamaClient(host=host)
+        self.client = _get_ollama_client(host)
         self.model = model
+        # Semantic cache: near-duplicate goals ("calc: 1+1" vs "calc: 1 + 1")
+        # reuse a cached plan when cosine similarity of their embeddings clears
+        # the threshold. Embeddings come from a small dedicated model (pull
+        # with `ollama pull nomic-embed-text`) — embedding through the 8B
+        # chat model would cost the same order as the call being avoided.
+        # Vectors live as L2-normalized rows of one float32 matrix so a
+        # lookup is a single matrix-vector product.
+        self.embed_model = embed_model
+        self.semantic_threshold = semantic_threshold
+        self._sem_vecs: Optional[np.ndarray] = None  # (N, D) float32
+        self._sem_keys: List[str] = []
+        self._sem_plans: List[Dict[str, Any]] = []
+        self._sem_maxsize = semantic_maxsize
+        # Exact-match plan cache: repeated goals skip the LLM call entirely.
+        # LRU via OrderedDict; optionally write-through to shelve so a restart
+        # can reuse plans from prior runs (pass e.g. cache_db_path="plan_cache.db").
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_maxsize = cache_maxsize
+        self._cache_db = None
+        if cache_db_path:
+            try:
+                self._cache_db = shelve.open(cache_db_path)
+            except Exception as e:
+                trace_event("plan_cache_db_error", {"path": cache_db_path, "error": str(e)})
+
+    def _cache_key(self, content: str, salt: str) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(_PROMPT_PREFIX_BYTES)
+        h.update(json.dumps([self.model, salt, content]).encode("utf-8"))
+        return h.hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        plan = self._cache.get(key)
+        if plan is not None:
+            self._cache.move_to_end(key)
+            return plan
+        if self._cache_db is not None:
+            return self._cache_db.get(key)
+        return None
+
+    def _cache_put(self, key: str, plan: Dict[str, Any]) -> None:
+        self._cache[key] = plan
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_maxsize:
+            self._cache.popitem(last=False)
+        if self._cache_db is not None:
+            self._cache_db[key] = plan
+
+    def _chat_streaming(self, msgs: List[Dict[str, str]]) -> str:
+        """
+        Stream the chat response and stop as soon as the top-level JSON
+        object closes. The policy only ever needs one JSON object, so any
+        trailing tokens (stray prose, a second object) are never generated:
+        closing the stream aborts the request server-side.
+        """
+        parts: List[str] = []
+        depth = 0
+        started = False
+        in_str = False
+        escaped = False
+        stream = self.client.chat(
+            model=self.model, messages=msgs, options={"temperature": 0.2}, stream=True
+        )
+        for chunk in stream:
+            piece = chunk["message"]["content"]
+            parts.append(piece)
+            for ch in piece:
+                if escaped:
+                    escaped = False
+                    continue
+                if ch == "\\" and in_str:
+                    escaped = True
+                elif ch == '"':
+                    in_str = not in_str
+                elif not in_str and ch == "{":
+                    depth += 1
+                    started = True
+                elif not in_str and ch == "}":
+                    depth -= 1
+            if started and depth == 0:
+                trace_event("llm_stream_early_stop", {"chars": sum(len(p) for p in parts)})
+                break
+        return "".join(parts)
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text via Ollama; None if the endpoint is unavailable."""
+        try:
+            vec = self.client.embeddings(model=self.embed_model, prompt=text)["embedding"]
+        except Exception as e:
+            trace_event("embedding_error", {"error": str(e)})
+            return None
+        q = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(q))
+        return q / norm if norm else q
+
+    def _semantic_get(self, context_key: str, vec: np.ndarray) -> Optional[Dict[str, Any]]:
+        if self._sem_vecs is None:
+            return None
+        # Rows and query are unit vectors, so one matrix-vector product
+        # yields every cosine similarity; entries from other contexts are
+        # masked out before taking the best match.
+        sims = self._sem_vecs @ vec
+        same_ctx = np.array([key == context_key for key in self._sem_keys])
+        sims = np.where(same_ctx, sims, -1.0)
+        best = int(np.argmax(sims))
+        if sims[best] >= self.semantic_threshold:
+            trace_event("llm_semantic_cache_hit", {"similarity": round(float(sims[best]), 4)})
+            return self._sem_plans[best]
+        return None
+
+    def _semantic_put(self, context_key: str, vec: np.ndarray, plan: Dict[str, Any]) -> None:
+        row = vec[np.newaxis, :]
+        self._sem_vecs = row if self._sem_vecs is None else np.vstack([self._sem_vecs, row])
+        self._sem_keys.append(context_key)
+        self._sem_plans.append(plan)
+        if len(self._sem_keys) > self._sem_maxsize:
+            self._sem_vecs = self._sem_vecs[1:]
+            self._sem_keys.pop(0)
+            self._sem_plans.pop(0)
 
     def build_system_prompt(self) -> str:
-        tool_desc = "\n".join([f"- {t.name}: {t.description}" for t in TOOLS.values()])
-        return (
-            "You are a tool-using agent. You must respond ONLY with a single JSON object.\n"
-            "You have these tools:\n"
-            f"{tool_desc}\n\n"
-            "Respond with one of two shapes:\n"
-            '{"action":"tool","tool":"<one of the tools>","input":"<string>","reason":"<short>"}\n'
-            'OR {"action":"final","answer":"<string>","reason":"<short>"}\n'
-            "Never include markdown, commentary, or extra text—JSON only.\n"
-        )
+        return SYSTEM_PROMPT
 
     def fewshot(self) -> List[Dict[str, str]]:
-        return [
-            {
-                "role": "user",
-                "content": "calc: sqrt(2)**2 + 3",
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({"action": "tool", "tool": "calculator", "input": "sqrt(2)**2 + 3", "reason": "User asked to compute."})
-            },
-            {
-                "role": "user",
-                "content": "remember: snack=banana",
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({"action": "tool", "tool": "memory", "input": "remember: snack=banana", "reason": "Store a fact."})
-            },
-            {
-                "role": "user",
-                "content": "What can you do?",
-            },
-            {
-                "role": "assistant",
-                "content": json.dumps({"action": "final", "answer": "I can use calculator/memory/todo tools. Try 'calc: 2+2' or 'todo: add: buy milk'.", "reason": "General answer"})
-            },
-        ]
+        return FEWSHOT
 
-    def plan(self, user_goal: str, last_observation: Optional[str]) -> Dict[str, Any]:
-        msgs = [{"role": "system", "content": self.build_system_prompt()}]
-        msgs.extend(self.fewshot())
+    def plan(self, user_goal: str, last_observation: Optional[str], cache_salt: str = "") -> Dict[str, Any]:
         content = user_goal if not last_observation else f"{user_goal}\n(last_observation: {last_observation})"
-        msgs.append({"role": "user", "content": content})
+        msgs = [*BASE_MSGS, {"role": "user", "content": content}]
+
+        key = self._cache_key(content, cache_salt)
+        cached = self._cache_get(key)
+        if cached is not None:
+            trace_event("llm_cache_hit", {"model": self.model, "key": key})
+            return cached
+
+        vec = self._embed(content)
+        if vec is not None:
+            near = self._semantic_get(cache_salt, vec)
+            if near is not None:
+                self._cache_put(key, near)
+                return near
 
         trace_event("llm_request", {"model": self.model, "messages_len": len(msgs)})
-        resp = self.client.chat(model=self.model, messages=msgs, options={"temperature": 0.2})
-        raw = resp["message"]["content"].strip()
+        raw = self._chat_streaming(msgs).strip()
         trace_event("llm_raw_response", {"raw": raw[:500] + ("..." if len(raw) > 500 else "")})
 
         # ensure it's pure JSON (some models add stray code fences)
         raw = raw.strip().lstrip("`").rstrip("`")
         try:
-            plan = json.loads(raw)
+            plan = _json_loads(raw)
         except Exception as e:
             trace_event("llm_parse_error", {"error": str(e), "raw": raw})
             # Fail closed with a safe final response
@@ -295,8 +620,44 @@ class LLMPolicy:
         if not ok:
             trace_event("llm_plan_invalid", {"why": why, "plan": plan})
             return {"action": "final", "answer": "Sorry—my plan failed validation.", "reason": why}
+        self._cache_put(key, plan)
+        if vec is not None:
+            self._semantic_put(cache_salt, vec, plan)
         return plan
 
+# -------------------------------
+# DETERMINISTIC ROUTER
+# -------------------------------
+# Goals with the demo's command prefixes ('calc:', 'todo:', 'remember:', ...)
+# map to exactly one tool call; routing them with compiled regexes skips the
+# LLM round-trip entirely.
+_DETERMINISTIC_ROUTES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"^calc:\s*(?P<input>.+)$", re.IGNORECASE | re.DOTALL), "calculator"),
+    (re.compile(r"^todo:\s*(?P<input>.+)$", re.IGNORECASE | re.DOTALL), "todo"),
+    (re.compile(r"^(?P<input>(?:remember|recall):\s*.+|dump)$", re.IGNORECASE | re.DOTALL), "memory"),
+]
+
+def route_deterministic(goal: str) -> Optional[Dict[str, Any]]:
+    """Return a tool plan for unambiguous goals, or None to ask the LLM."""
+    g = goal.strip()
+    for pattern, tool_name in _DETERMINISTIC_ROUTES:
+        m = pattern.match(g)
+        if m:
+            inp = m.group("input").strip()
+            if tool_name == "memory":
+                # The route matched case-insensitively but memory_tool's
+                # prefix checks are exact; lowercase only the command word
+                # so 'Remember: A=1' works without touching the payload.
+                head, sep, rest = inp.partition(":")
+                inp = head.lower() + sep + rest if sep else inp.lower()
+            return {
+                "action": "tool",
+                "tool": tool_name,
+                "input": inp,
+                "reason": "deterministic route",
+            }
+    return None
+
 # -------------------------------
 # AGENT CORE
 # -------------------------------
@@ -305,13 +666,35 @@ class Agent:
         self.tools = tools
         self.policy = policy
         self.max_steps = max_steps
-        self.memory: Dict[str, Any] = {"facts": {}, "todos": []}
+        self.memory: Dict[str, Any] = _new_memory()
 
     def run(self, goal: str) -> str:
+        # Unambiguous command-style goals resolve in one tool call with no
+        # LLM involvement; the tool result is the answer.
+        routed = route_deterministic(goal)
+        if routed is not None and Guardrails.validate_plan(routed)[0]:
+            trace_event("agent_deterministic_route", {"goal": goal, "plan": routed})
+            tool = self.tools[routed["tool"]]
+            try:
+                result = Guardrails.with_timeout(tool, routed["input"], {"memory": self.memory})
+            except concurrent.futures.TimeoutError:
+                result = f"Tool '{routed['tool']}' timed out."
+            except Exception as e:
+                result = f"Tool '{routed['tool']}' failed: {e}"
+            trace_event("agent_final", {"answer": result})
+            return result
+
         observation = None
         for step in range(self.max_steps):
             trace_event("agent_step_begin", {"step": step + 1, "goal": goal, "observation": observation})
-            plan = self.policy.plan(goal, observation)
+            # Salt the plan cache with the current facts so cached plans never
+            # leak across differing memory states. blake2b over canonical
+            # JSON, not built-in hash(): str hashing is randomized per
+            # process, which would make persisted cache entries unhittable
+            # on later runs.
+            facts_json = json.dumps(self.memory["facts"], sort_keys=True)
+            salt = hashlib.blake2b(facts_json.encode(), digest_size=8).hexdigest()
+            plan = self.policy.plan(goal, observation, cache_salt=salt)
             trace_event("agent_plan", {"step": step + 1, "plan": plan})
 
             action = plan["action"]
@@ -343,6 +726,18 @@ class Agent:
                     observation = f"Tool '{tool_name}' failed: {e}"
                     trace_event("agent_tool_exception", {"tool": tool_name, "error": str(e), "trace": traceback.format_exc()})
                 # loop continues
+            elif action == "tools":
+                # Independent calls fan out across the shared pool in one turn.
+                calls = plan["calls"]
+                start = time.time()
+                results = Guardrails.run_parallel(calls, {"memory": self.memory})
+                elapsed = round(time.time() - start, 4)
+                observation = "\n".join(f"{name}: {result}" for name, result in results)
+                trace_event("agent_tools_result", {
+                    "tools": [c["tool"] for c in calls],
+                    "elapsed": elapsed,
+                    "result": observation[:500],
+                })
             else:
                 trace_event("agent_invalid_plan", {"plan": plan})
                 return "Invalid plan."
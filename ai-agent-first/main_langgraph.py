@@ -9,13 +9,18 @@ Setup
 """
 
 from __future__ import annotations
+from collections import OrderedDict, deque
 from typing import TypedDict, Dict, Any, Optional, List, Tuple, Callable
 from dataclasses import dataclass
-from datetime import datetime
+import ast
+import atexit
 import concurrent.futures
+import hashlib
+import operator
 import traceback
 import json
 import math
+import re
 import time
 import os
 
@@ -31,6 +36,20 @@ except Exception:
     logger = logging.getLogger("agent")
     LOGURU = False
 
+# Optional orjson: much faster dumps/loads, stdlib fallback otherwise.
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _json_loads = orjson.loads
+except Exception:
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    _json_loads = json.loads
+
 TRACE_JSONL_PATH = "agent_trace.jsonl"
 HUMAN_LOG_PATH = "agent.log"
 
@@ -44,10 +63,38 @@ def _setup_logging():
 
 _setup_logging()
 
+# Wall-clock anchor + monotonic delta: no datetime/isoformat per event.
+_TRACE_EPOCH_NS = time.time_ns() - time.monotonic_ns()
+
+# Buffered tracing through a per-process fd: O_APPEND keeps appends atomic,
+# writev lands each batch in one syscall.
+_TRACE_BUFFER: List[bytes] = []
+_TRACE_FLUSH_EVERY = 32
+_TRACE_FD: Optional[int] = None
+
+def _trace_fd() -> int:
+    global _TRACE_FD
+    if _TRACE_FD is None:
+        _TRACE_FD = os.open(TRACE_JSONL_PATH, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    return _TRACE_FD
+
+def flush_trace():
+    if not _TRACE_BUFFER:
+        return
+    fd = _trace_fd()
+    if hasattr(os, "writev"):
+        os.writev(fd, _TRACE_BUFFER)
+    else:  # Windows has no writev
+        os.write(fd, b"".join(_TRACE_BUFFER))
+    _TRACE_BUFFER.clear()
+
+atexit.register(flush_trace)
+
 def trace_event(event: str, payload: Dict[str, Any]):
-    row = {"ts": datetime.utcnow().isoformat() + "Z", "event": event, "payload": payload}
-    with open(TRACE_JSONL_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    row = {"ts_ns": _TRACE_EPOCH_NS + time.monotonic_ns(), "event": event, "payload": payload}
+    _TRACE_BUFFER.append((_json_dumps(row) + "\n").encode("utf-8"))
+    if len(_TRACE_BUFFER) >= _TRACE_FLUSH_EVERY:
+        flush_trace()
     if LOGURU:
         logger.bind(event=event).info(payload)
     else:
@@ -62,14 +109,51 @@ class Tool:
     description: str
     fn: Callable[[str, Dict[str, Any]], str]
 
+# Math namespace resolved once; dir(math) filtering per call is wasted work.
+_CALC_ALLOWED_NAMES = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
+
+# Arithmetic-only AST whitelist, mirroring the plain agent's calculator.
+_CALC_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv,
+    ast.Mod, ast.Pow, ast.USub, ast.UAdd, ast.Tuple,
+)
+
+# Single binary operations ('13**2 + 7' style inputs reduce to these after
+# routing) dispatch straight through operator, skipping parse/compile/eval.
+_SIMPLE_EXPR_RE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*(\*\*|[+\-*/%])\s*(-?\d+(?:\.\d+)?)$")
+_SIMPLE_OPS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "%": operator.mod, "**": operator.pow,
+}
+
+def _num(tok: str):
+    return float(tok) if "." in tok else int(tok)
+
 def calculator_tool(inp: str, ctx: Dict[str, Any]) -> str:
-    allowed_names = {k: getattr(math, k) for k in dir(math) if not k.startswith("_")}
-    allowed_names.update({"__builtins__": {}})
     expr = inp.strip()
-    if any(tok in expr for tok in ["__", "import", "open(", "exec", "eval", "os.", "sys."]):
-        return "Calculator error: disallowed token."
+    m = _SIMPLE_EXPR_RE.match(expr)
+    # '**' binds tighter than unary minus (-5**2 == -(5**2)), so a signed
+    # base falls through to the AST path rather than computing (-5)**2
+    if m and not (m.group(2) == "**" and m.group(1).startswith("-")):
+        a, op, b = m.groups()
+        try:
+            return str(_SIMPLE_OPS[op](_num(a), _num(b)))
+        except Exception as e:
+            return f"Calculator error: {e}"
     try:
-        return str(eval(expr, allowed_names, {}))
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        return f"Calculator error: {e}"
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALC_ALLOWED_NODES):
+            return f"Calculator error: disallowed syntax: {type(node).__name__}."
+        if isinstance(node, ast.Name) and node.id not in _CALC_ALLOWED_NAMES:
+            return f"Calculator error: unknown name: {node.id}."
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            return "Calculator error: only direct math function calls are allowed."
+    try:
+        return str(eval(compile(tree, "<calc>", "eval"), {"__builtins__": {}}, _CALC_ALLOWED_NAMES))
     except Exception as e:
         return f"Calculator error: {e}"
 
@@ -91,7 +175,7 @@ def memory_tool(inp: str, ctx: Dict[str, Any]) -> str:
     return "Usage: 'remember: k=v' | 'recall: k' | 'dump'"
 
 def todo_tool(inp: str, ctx: Dict[str, Any]) -> str:
-    todos: List[str] = ctx["memory"].setdefault("todos", [])
+    todos: deque = ctx["memory"].setdefault("todos", deque())
     cmd = inp.strip().lower()
     if cmd.startswith("add:"):
         item = inp.split(":", 1)[1].strip()
@@ -112,47 +196,96 @@ TOOLS: Dict[str, Tool] = {
     "todo":       Tool("todo",       "Manage a simple todo list",   todo_tool),
 }
 
+def _new_memory() -> Dict[str, Any]:
+    """Preallocated memory layout; todos use a deque for O(1) ends."""
+    return {"facts": {}, "todos": deque()}
+
 # ================
 # GUARDRAILS
 # ================
+# Structural plan validation compiles to a pydantic TypeAdapter once at
+# import (pydantic v2 validators run in Rust); the hand-rolled checks stay
+# as a fallback when pydantic is missing.
+try:
+    from typing import Literal, Union
+    from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+    class _FinalPlan(BaseModel):
+        model_config = ConfigDict(extra="allow")
+        action: Literal["final"]
+        answer: str
+
+    class _ToolPlan(BaseModel):
+        model_config = ConfigDict(extra="allow")
+        action: Literal["tool"]
+        tool: str
+        input: str
+
+    _PLAN_ADAPTER: Optional[TypeAdapter] = TypeAdapter(Union[_FinalPlan, _ToolPlan])
+except Exception:
+    _PLAN_ADAPTER = None
+
 class Guardrails:
     MAX_STEPS = 6
     MAX_TOOL_INPUT_CHARS = 400
     ALLOWED_TOOLS = set(TOOLS.keys())
     BLOCKLIST = ["rm -rf", "shutdown", "format c:", "DROP TABLE", "TRUNCATE TABLE"]
+    # Single compiled case-insensitive alternation; one scan per input.
+    _BLOCKLIST_RE = re.compile("|".join(re.escape(b) for b in BLOCKLIST), re.IGNORECASE)
     TOOL_TIMEOUT_SECS = {"calculator": 2, "memory": 2, "todo": 2}
+    # Hang-proof in-process tools skip the executor round-trip entirely.
+    INLINE_TOOLS = {"memory", "todo"}
 
     @staticmethod
     def validate_plan(plan: Dict[str, Any]) -> Tuple[bool, str]:
-        if not isinstance(plan, dict):
-            return False, "Plan must be an object."
-        if "action" not in plan:
-            return False, "Missing 'action'."
-        if plan["action"] not in ("final", "tool"):
-            return False, "Invalid 'action'."
-        if plan["action"] == "final":
-            if not isinstance(plan.get("answer"), str):
+        # Structural shape: compiled adapter when available, manual otherwise.
+        if _PLAN_ADAPTER is not None:
+            try:
+                _PLAN_ADAPTER.validate_python(plan)
+            except Exception as e:
+                return False, f"Plan failed schema validation: {str(e)[:200]}"
+        else:
+            if not isinstance(plan, dict):
+                return False, "Plan must be an object."
+            if plan.get("action") not in ("final", "tool"):
+                return False, "Invalid 'action'."
+            if plan["action"] == "final" and not isinstance(plan.get("answer"), str):
                 return False, "Final requires string 'answer'."
+            if plan["action"] == "tool" and (
+                not isinstance(plan.get("tool"), str) or not isinstance(plan.get("input"), str)
+            ):
+                return False, "Tool plan requires string 'tool' and 'input'."
+        # Runtime constraints the schema can't express.
         if plan["action"] == "tool":
-            tool = plan.get("tool")
-            tool_input = plan.get("input")
+            tool = plan["tool"]
+            tool_input = plan["input"]
             if tool not in Guardrails.ALLOWED_TOOLS:
                 return False, f"Tool must be one of {sorted(Guardrails.ALLOWED_TOOLS)}."
-            if not isinstance(tool_input, str):
-                return False, "Tool plan requires string 'input'."
             if len(tool_input) > Guardrails.MAX_TOOL_INPUT_CHARS:
                 return False, "Tool input too long."
-            for bad in Guardrails.BLOCKLIST:
-                if bad.lower() in tool_input.lower():
-                    return False, f"Blocked content: {bad!r}"
+            hit = Guardrails._BLOCKLIST_RE.search(tool_input)
+            if hit:
+                return False, f"Blocked content: {hit.group(0)!r}"
         return True, ""
 
+    # Shared pool: avoids a thread spawn/join per tool call.
+    _EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @classmethod
+    def _executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        if cls._EXECUTOR is None:
+            cls._EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="tool"
+            )
+        return cls._EXECUTOR
+
     @staticmethod
     def with_timeout(tool: Tool, tool_input: str, ctx: Dict[str, Any]) -> str:
+        if tool.name in Guardrails.INLINE_TOOLS:
+            return tool.fn(tool_input, ctx)
         timeout = Guardrails.TOOL_TIMEOUT_SECS.get(tool.name, 3)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-            fut = ex.submit(tool.fn, tool_input, ctx)
-            return fut.result(timeout=timeout)
+        fut = Guardrails._executor().submit(tool.fn, tool_input, ctx)
+        return fut.result(timeout=timeout)
 
 # ================
 # LLM POLICY (Ollama)
@@ -162,49 +295,76 @@ try:
 except Exception:
     OllamaClient = None
 
+# One client (one httpx connection pool) per host per process.
+_OLLAMA_CLIENTS: Dict[str, Any] = {}
+
+def _get_ollama_client(host: str):
+    client = _OLLAMA_CLIENTS.get(host)
+    if client is None:
+        client = _OLLAMA_CLIENTS[host] = OllamaClient(host=host)
+    return client
+
+# Prompt pieces joined once at import: keeps the prefix byte-stable for
+# Ollama's KV cache and avoids re-joining/re-dumping per plan() call.
+TOOL_DESC = "\n".join(f"- {t.name}: {t.description}" for t in TOOLS.values())
+
+SYSTEM_PROMPT = (
+    "You are a tool-using agent. Respond with EXACTLY one JSON object.\n"
+    "Tools:\n" + TOOL_DESC + "\n\n"
+    "Schemas:\n"
+    '{"action":"tool","tool":"<tool>","input":"<string>","reason":"<short>"}\n'
+    'OR {"action":"final","answer":"<string>","reason":"<short>"}\n'
+    "Rules:\n"
+    "- If the last observation indicates success or directly answers the user (e.g., todo added, list printed, value computed, fact recalled), respond with a FINAL answer. Do NOT call the same tool twice with the same input.\n"
+    "- JSON only. No extra text.\n"
+)
+
+FEWSHOT: List[Dict[str, str]] = [
+    {"role": "user", "content": "calc: sqrt(2)**2 + 3"},
+    {"role": "assistant", "content": json.dumps({"action":"tool","tool":"calculator","input":"sqrt(2)**2 + 3","reason":"Compute."})},
+    {"role": "user", "content": "remember: snack=banana"},
+    {"role": "assistant", "content": json.dumps({"action":"tool","tool":"memory","input":"remember: snack=banana","reason":"Store fact."})},
+    {"role": "user", "content": "What can you do?"},
+    {"role": "assistant", "content": json.dumps({"action":"final","answer":"I can use calculator/memory/todo tools.","reason":"General answer"})},
+]
+
 class LLMPolicy:
-    def __init__(self, model: str = "llama3.1", host: str = "http://localhost:11434"):
+    def __init__(self, model: str = "llama3.1", host: str = "http://localhost:11434",
+                 cache_maxsize: int = 512):
         if OllamaClient is None:
             raise RuntimeError("Install 'ollama' (pip install ollama)")
-        self.client = OllamaClient(host=host)
+        self.client = _get_ollama_client(host)
         self.model = model
+        # Exact-match LRU plan cache: repeat goals skip the LLM round-trip.
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_maxsize = cache_maxsize
 
     def system_prompt(self) -> str:
-        tool_desc = "\n".join([f"- {t.name}: {t.description}" for t in TOOLS.values()])
-        
-        return (
-            "You are a tool-using agent. Respond with EXACTLY one JSON object.\n"
-            "Tools:\n" + tool_desc + "\n\n"
-            "Schemas:\n"
-            '{"action":"tool","tool":"<tool>","input":"<string>","reason":"<short>"}\n'
-            'OR {"action":"final","answer":"<string>","reason":"<short>"}\n'
-            "Rules:\n"
-            "- If the last observation indicates success or directly answers the user (e.g., todo added, list printed, value computed, fact recalled), respond with a FINAL answer. Do NOT call the same tool twice with the same input.\n"
-            "- JSON only. No extra text.\n"
-        )
+        return SYSTEM_PROMPT
 
     def fewshot(self) -> List[Dict[str, str]]:
-        return [
-            {"role": "user", "content": "calc: sqrt(2)**2 + 3"},
-            {"role": "assistant", "content": json.dumps({"action":"tool","tool":"calculator","input":"sqrt(2)**2 + 3","reason":"Compute."})},
-            {"role": "user", "content": "remember: snack=banana"},
-            {"role": "assistant", "content": json.dumps({"action":"tool","tool":"memory","input":"remember: snack=banana","reason":"Store fact."})},
-            {"role": "user", "content": "What can you do?"},
-            {"role": "assistant", "content": json.dumps({"action":"final","answer":"I can use calculator/memory/todo tools.","reason":"General answer"})},
-        ]
+        return FEWSHOT
 
     def plan(self, goal: str, last_observation: Optional[str]) -> Dict[str, Any]:
-        msgs = [{"role": "system", "content": self.system_prompt()}]
-        msgs.extend(self.fewshot())
+        msgs = [{"role": "system", "content": SYSTEM_PROMPT}]
+        msgs.extend(FEWSHOT)
         msgs.append({"role": "user", "content": goal if not last_observation else f"{goal}\n(last_observation: {last_observation})"})
 
+        blob = json.dumps([self.model, msgs], sort_keys=True).encode("utf-8")
+        key = hashlib.blake2b(blob, digest_size=16).hexdigest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            trace_event("llm_cache_hit", {"model": self.model, "key": key})
+            return cached
+
         trace_event("llm_request", {"model": self.model, "messages_len": len(msgs)})
         resp = self.client.chat(model=self.model, messages=msgs, options={"temperature": 0.2})
         raw = resp["message"]["content"].strip().strip("`")
         trace_event("llm_raw_response", {"raw": raw[:500] + ("..." if len(raw) > 500 else "")})
 
         try:
-            plan = json.loads(raw)
+            plan = _json_loads(raw)
         except Exception as e:
             trace_event("llm_parse_error", {"error": str(e), "raw": raw})
             return {"action": "final", "answer": "Sorry—I couldn't understand the plan.", "reason": "Invalid JSON"}
@@ -212,6 +372,10 @@ class LLMPolicy:
         if not ok:
             trace_event("llm_plan_invalid", {"why": why, "plan": plan})
             return {"action": "final", "answer": "Sorry—my plan failed validation.", "reason": why}
+        self._cache[key] = plan
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_maxsize:
+            self._cache.popitem(last=False)
         return plan
 
 # ================
@@ -233,6 +397,16 @@ class AgentState(TypedDict, total=False):
 # ================
 policy = LLMPolicy(model="llama3.1")
 
+def _plan_call_digest(plan: Dict[str, Any]) -> str:
+    """
+    Stable structural hash of a tool call. Hashing tool+input through
+    canonical JSON means the dedup check compares two small strings, is
+    insensitive to key order or dict identity, and keeps only a digest in
+    graph state instead of the raw input text.
+    """
+    blob = json.dumps([plan["tool"], plan.get("input", "")], sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
 def policy_node(state: AgentState) -> AgentState:
     step = state.get("step", 0) + 1
     if step > Guardrails.MAX_STEPS:
@@ -251,7 +425,7 @@ def policy_node(state: AgentState) -> AgentState:
 
     # --- cycle breaker: if same tool+input repeats, finalize with last observation
     if plan.get("action") == "tool":
-        current_call = (plan["tool"], plan.get("input", ""))
+        current_call = _plan_call_digest(plan)
         last_call = state.get("last_tool_call")
         if last_call == current_call:
             obs = state.get("observation") or "Done."
@@ -274,7 +448,7 @@ def tool_node(state: AgentState) -> AgentState:
     tool_input = plan["input"]
     try:
         start = time.time()
-        result = Guardrails.with_timeout(tool, tool_input, {"memory": state.setdefault("memory", {"facts": {}, "todos": []})})
+        result = Guardrails.with_timeout(tool, tool_input, {"memory": state.setdefault("memory", _new_memory())})
         elapsed = round(time.time() - start, 4)
         trace_event("agent_tool_result", {"tool": tool_name, "elapsed": elapsed, "result": result[:500]})
         return {"observation": result}
@@ -328,9 +502,51 @@ GRAPH = build_graph()
 # ================
 # PUBLIC RUN API
 # ================
+# Command-prefixed goals resolve in exactly one tool call, so they bypass
+# the graph entirely: no policy LLM call, no langgraph invoke() machinery.
+_DETERMINISTIC_ROUTES: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"^calc:\s*(?P<input>.+)$", re.IGNORECASE | re.DOTALL), "calculator"),
+    (re.compile(r"^todo:\s*(?P<input>.+)$", re.IGNORECASE | re.DOTALL), "todo"),
+    (re.compile(r"^(?P<input>(?:remember|recall):\s*.+|dump)$", re.IGNORECASE | re.DOTALL), "memory"),
+]
+
+def route_deterministic(goal: str) -> Optional[Dict[str, Any]]:
+    g = goal.strip()
+    for pattern, tool_name in _DETERMINISTIC_ROUTES:
+        m = pattern.match(g)
+        if m:
+            inp = m.group("input").strip()
+            if tool_name == "memory":
+                # The route matched case-insensitively but memory_tool's
+                # prefix checks are exact; lowercase only the command word
+                # so 'Remember: A=1' works without touching the payload.
+                head, sep, rest = inp.partition(":")
+                inp = head.lower() + sep + rest if sep else inp.lower()
+            return {
+                "action": "tool",
+                "tool": tool_name,
+                "input": inp,
+                "reason": "deterministic route",
+            }
+    return None
+
 def run_agent(goal: str) -> str:
-    state: AgentState = {"goal": goal, "step": 0, "memory": {"facts": {}, "todos": []}}
+    state: AgentState = {"goal": goal, "step": 0, "memory": _new_memory()}
     trace_event("agent_start", {"goal": goal})
+
+    routed = route_deterministic(goal)
+    if routed is not None and Guardrails.validate_plan(routed)[0]:
+        trace_event("agent_deterministic_route", {"goal": goal, "plan": routed})
+        tool = TOOLS[routed["tool"]]
+        try:
+            answer = Guardrails.with_timeout(tool, routed["input"], {"memory": state["memory"]})
+        except concurrent.futures.TimeoutError:
+            answer = f"Tool '{routed['tool']}' timed out."
+        except Exception as e:
+            answer = f"Tool '{routed['tool']}' failed: {e}"
+        trace_event("agent_final", {"answer": answer})
+        return answer
+
     # Run to completion; bump recursion_limit in case the model needs a few hops
     result = GRAPH.invoke(state, config={"recursion_limit": 50})
     return result.get("answer", "(no answer)")
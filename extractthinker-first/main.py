@@ -1,8 +1,12 @@
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
+
 from extract_thinker import (
     Extractor, LLM, Classification, Contract, DocumentLoaderPyPdf
 )
+from pypdf import PdfReader
 
 #=========================
 #   UTILS
@@ -30,9 +34,55 @@ class JobOfferContract(Contract):
 cv_candidate_path = os.path.join("files", "CV_Candidate.pdf")
 job_offer_path = os.path.join("files", "Job_Offer.pdf")
 
+def _read_pdf_bytes(path: str) -> io.BytesIO:
+    """Read the PDF from disk once; every parse reuses the in-memory buffer
+    instead of re-reading the file (the loader and extractor each reopen
+    their source otherwise). Remember to seek(0) before each reuse."""
+    with open(path, "rb") as f:
+        return io.BytesIO(f.read())
+
+def _extract_pages(args: tuple[str | bytes, int, int]) -> list[str]:
+    # Workers get a path or raw bytes: PdfReader objects don't pickle.
+    source, start, stop = args
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    pages = PdfReader(source).pages
+    return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+class ParallelPdfLoader(DocumentLoaderPyPdf):
+    """
+    DocumentLoaderPyPdf with page-text extraction fanned across CPU cores.
+    PyPdf parses pages single-threaded, which dominates load time for
+    multi-page PDFs; per-page extraction is embarrassingly parallel.
+    Falls back to the stock loader for single-page files or on any
+    worker failure.
+    """
+
+    def load(self, source):
+        try:
+            n_pages = len(PdfReader(source).pages)
+            if n_pages > 1:
+                # Ship bytes to workers when the source is an in-memory buffer.
+                worker_source = source.getvalue() if isinstance(source, io.BytesIO) else source
+                # One contiguous page range per worker — a task per page
+                # would re-parse the whole document once per page.
+                step = -(-n_pages // (os.cpu_count() or 1))
+                ranges = [
+                    (worker_source, start, min(start + step, n_pages))
+                    for start in range(0, n_pages, step)
+                ]
+                with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+                    texts = [text for chunk in ex.map(_extract_pages, ranges) for text in chunk]
+                return [{"content": text} for text in texts]
+        except Exception:
+            pass
+        if isinstance(source, io.BytesIO):
+            source.seek(0)
+        return super().load(source)
+
 # Initialize document loader
 ## document_loader = DocumentLoaderMarkItDown()
-document_loader = DocumentLoaderPyPdf()
+document_loader = ParallelPdfLoader()
 
 # Initialize the extractor
 extractor = Extractor()
@@ -58,18 +108,27 @@ classifications = [
 #=========================
 #   MAIN
 #=========================
-print("Document Loader")
-print(extractor.get_document_loader_for_file(cv_candidate_path))
-
-print("Loaded Content")
-print(extractor.document_loader.load(cv_candidate_path))
-
-# Extract features from document
-print("Basic Extraction of Fields")
-## cv_features: CVContract = extractor.extract(cv_candidate_path, CVContract)
-## print(cv_features)
-jb_features: JobOfferContract = extractor.extract(job_offer_path, JobOfferContract)
-print(jb_features)
+# Guarded so the page-extraction workers re-importing this module under the
+# spawn start method don't re-run the script body
+if __name__ == "__main__":
+    cv_candidate_pdf = _read_pdf_bytes(cv_candidate_path)
+    job_offer_pdf = _read_pdf_bytes(job_offer_path)
+
+    print("Document Loader")
+    print(extractor.get_document_loader_for_file(cv_candidate_path))
+
+    print("Loaded Content")
+    cv_candidate_pdf.seek(0)
+    print(extractor.document_loader.load(cv_candidate_pdf))
+
+    # Extract features from document
+    print("Basic Extraction of Fields")
+    ## cv_candidate_pdf.seek(0)
+    ## cv_features: CVContract = extractor.extract(cv_candidate_pdf, CVContract)
+    ## print(cv_features)
+    job_offer_pdf.seek(0)
+    jb_features: JobOfferContract = extractor.extract(job_offer_pdf, JobOfferContract)
+    print(jb_features)
 
 """
 # Classify document
@@ -1,7 +1,69 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from pydantic import BaseModel
+from transformers import pipeline
+
+# You can check any other model in the Hugging Face Hub
+pipe = pipeline(model="distilbert/distilbert-base-uncased-finetuned-sst-2-english")
+
+# Micro-batching: requests enqueue (prompt, future) pairs and a background
+# task drains whatever has accumulated and runs one pipe(batch) call, so
+# under load the model sees full batches instead of one prompt at a time.
+MAX_BATCH = 32
+queue: asyncio.Queue = asyncio.Queue()
+
+async def batcher():
+    while True:
+        items = [await queue.get()]
+        while len(items) < MAX_BATCH:
+            try:
+                items.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        prompts = [prompt for prompt, _ in items]
+        # Run the blocking forward pass off the event loop. batch_size makes
+        # the pipeline run one batched forward instead of iterating the list
+        # one example at a time (its default for list inputs).
+        try:
+            outputs = await asyncio.to_thread(
+                pipe, prompts, batch_size=len(prompts), truncation=True
+            )
+        except Exception as e:
+            # Fail the drained requests but keep the batcher alive — an
+            # unhandled error here would strand every future request's future
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        for (_, future), output in zip(items, outputs):
+            future.set_result(output)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(batcher())
+    yield
+    task.cancel()
+
+# We define the app
+app = FastAPI(lifespan=lifespan)
+
+# We define that we expect our input to be a string
+class RequestModel(BaseModel):
+    input: str
 
 @app.get("/")
 def read_root():
     return {"message": "Hello, World!"}
+
+# Now we define that we accept post requests
+@app.post("/sentiment")
+async def get_response(request: RequestModel):
+    prompt = request.input
+    future = asyncio.get_running_loop().create_future()
+    await queue.put((prompt, future))
+    response = await future
+    label = response["label"]
+    score = response["score"]
+    return f"The '{prompt}' input is {label} with a score of {score}"
@@ -1,23 +1,41 @@
-from transformers import pipeline
+from typing import List
 
-# Defining directly the task we want to implement. 
-pipe = pipeline(task="sentiment-analysis")
+import torch
+from transformers import pipeline
 
-# Defining the model we choose. 
-pipe = pipeline(model="model-to-be-used")
+# One pipeline, constructed once: fp16 + GPU when CUDA is available.
+# (Re-assigning pipeline(...) several times just built and threw away models.)
+pipe = pipeline(
+    model="distilbert/distilbert-base-uncased-finetuned-sst-2-english",
+    device=0 if torch.cuda.is_available() else -1,
+    torch_dtype=torch.float16 if torch.cuda.is_available() else None,
+)
 
-# Defining the model we choose. 
-pipe = pipeline(model="distilbert/distilbert-base-uncased-finetuned-sst-2-english")
+# TorchDynamo traces the model once and TorchInductor emits fused kernels,
+# removing per-op Python dispatch on every forward pass. The throwaway call
+# pays the one-time compile cost up front instead of on the first request.
+try:
+   pipe.model = torch.compile(pipe.model, mode="reduce-overhead", fullgraph=False)
+   pipe("warmup")
+except Exception:
+   pass  # older torch or unsupported backend: keep eager execution
 
 print(pipe("This tutorial is great!"))
 
-def generate_response(prompt:str):
-   response = pipe("This is a great tutorial!")
-   label = response[0]["label"]
-   score = response[0]["score"]
-   return f"The '{prompt}' input is {label} with a score of {score}"
+def generate_responses(prompts: List[str]) -> List[str]:
+   # Batching amortizes tokenizer + forward-pass launch cost across prompts;
+   # one-at-a-time calls pay full dispatch overhead per prompt.
+   responses = pipe(prompts, batch_size=min(32, len(prompts)), truncation=True)
+   return [
+      f"The '{prompt}' input is {response['label']} with a score of {response['score']}"
+      for prompt, response in zip(prompts, responses)
+   ]
+
+def generate_response(prompt: str) -> str:
+   return generate_responses([prompt])[0]
 
 print(generate_response("This tutorial is great!"))
+print(generate_responses(["This tutorial is great!", "This tutorial is confusing!"]))
 
 
 """
@@ -43,4 +61,4 @@ def get_response(request: RequestModel):
    label = response[0]["label"]
    score = response[0]["score"]
    return f"The '{prompt}' input is {label} with a score of {score}"
-"""
\ No newline at end of file
+"""
@@ -28,6 +28,14 @@ def multiply(x, y):
 multiply_by_2 = partial(multiply, 2)  # Fix x = 2
 print(multiply_by_2(5))              # 10
 
+# Hot-path variant: each closure/partial call above pushes a Python frame
+# before reaching the arithmetic. The bound C methods compute the same
+# results with no wrapper frame — worth it when used inside map/tight loops.
+add_5_fast = (5).__add__
+print(add_5_fast(3))          # 8
+multiply_by_2_fast = (2).__mul__
+print(multiply_by_2_fast(5))  # 10
+
 #===========================
 #  Partial Application
 #===========================
@@ -57,6 +65,13 @@ def add_to_total(x):
     total += x
     return total
 
+# Pure alternative: itertools.accumulate yields the same running totals in
+# one C loop — no global write and no Python frame per element
+from itertools import accumulate
+
+totals = list(accumulate([1, 2, 3]))
+print(totals)  # [1, 3, 6]
+
 # Immutability
 original_list = [1, 2, 3]
 new_list = original_list + [4]  # Creates a new list
@@ -73,10 +88,9 @@ def apply_function(func, value):
 print(apply_function(square, 5))  # 25
 
 # Recursion for iteration
-def factorial(n):
-    if n == 0:
-        return 1
-    return n * factorial(n - 1)
+# math.factorial runs as a single C call; the recursive Python version pays
+# a frame allocation per step and hits RecursionError near n=1000
+from math import factorial
 
 print(factorial(5))  # 120
 
@@ -93,11 +107,14 @@ def compose(f, g):
 new_function = compose(multiply_by_two, add_three)
 print(new_function(5))  # (5 + 3) * 2 = 16
 
-from functools import reduce
-
-
 def compose(*functions):
-    return reduce(lambda f, g: lambda x: f(g(x)), functions)
+    # One flat loop instead of reduce's nested lambdas: the reduce version
+    # walks n stacked Python frames on every call of the composed function
+    def composed(x):
+        for f in reversed(functions):
+            x = f(x)
+        return x
+    return composed
 
 composed = compose(multiply_by_two, square)
 print(composed(5))  # 5^2 * 2 = 50
@@ -111,7 +128,11 @@ for num in numbers:
     squared_numbers.append(num ** 2)
 
 # Declarative approach (what to do)
-squared_numbers_fp = list(map(lambda x: x ** 2, numbers))
+# np.square runs one vectorized C kernel; the map(lambda ...) version pays
+# a lambda call and BINARY_POWER per element in the interpreter
+import numpy as np
+
+squared_numbers_fp = np.square(np.asarray(numbers)).tolist()
 
 print(squared_numbers)      # [1, 4, 9, 16, 25]
 print(squared_numbers_fp)   # [1, 4, 9, 16, 25]
@@ -18,3 +18,19 @@ print(result.value)  # 13
 
 none_result = Maybe(None).bind(lambda x: x * 2)
 print(none_result.value)  # None
+
+# Allocation-free variant: every bind() above heap-allocates a fresh Maybe
+# just to carry the value to the next step. Threading None through a flat
+# loop keeps the same short-circuit semantics with zero wrapper objects.
+def maybe_chain(x, *fs):
+    for f in fs:
+        if x is None:
+            return None
+        x = f(x)
+    return x
+
+result = maybe_chain(5, lambda x: x * 2, lambda x: x + 3)
+print(result)  # 13
+
+none_result = maybe_chain(None, lambda x: x * 2)
+print(none_result)  # None
@@ -1,26 +1,91 @@
-# Initialize the knowledge graph
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# Slotted record views over the column data. A plain dict-per-node costs
+# ~232B of header plus per-key hashing; a frozen slots dataclass stores the
+# same three fields in fixed offsets (~56B) and is immutable, so callers
+# can't desync a record from the underlying columns.
+@dataclass(slots=True, frozen=True)
+class Node:
+    id: str
+    label: str
+    properties: dict
+
+
+@dataclass(slots=True, frozen=True)
+class Edge:
+    source: str
+    target: str
+    relationship: str
+
+
+
+# Initialize the knowledge graph.
+# Structure-of-arrays layout: nodes and edges live in parallel columns
+# instead of a list of dicts, so queries scan contiguous arrays instead of
+# chasing per-dict pointers (and each node costs ~16B of column data rather
+# than ~240B of dict header).
 knowledge_graph = {
-    "nodes": [],
-    "edges": []
+    "node_ids": [],
+    "node_labels": [],
+    "node_properties": [],
+    "edge_src": [],       # node indices, not ids
+    "edge_dst": [],
+    "edge_rels": [],
+    "id_to_idx": {},      # node_id -> index into the node columns
 }
 
 # Function to add a node
 def add_node(graph, node_id, label, properties=None):
     if properties is None:
         properties = {}
-    graph["nodes"].append({
-        "id": node_id,
-        "label": label,
-        "properties": properties
-    })
+    graph["id_to_idx"][node_id] = len(graph["node_ids"])
+    graph["node_ids"].append(node_id)
+    graph["node_labels"].append(label)
+    graph["node_properties"].append(properties)
 
 # Function to add an edge
 def add_edge(graph, source_id, target_id, relationship):
-    graph["edges"].append({
-        "source": source_id,
-        "target": target_id,
-        "relationship": relationship
-    })
+    graph["edge_src"].append(graph["id_to_idx"][source_id])
+    graph["edge_dst"].append(graph["id_to_idx"][target_id])
+    graph["edge_rels"].append(relationship)
+
+# Freeze the columns into NumPy arrays once construction is done, and build
+# Compressed Sparse Row adjacency: edges sorted by source with an indptr
+# offset table, so each node's neighbors are one contiguous slice.
+def finalize(graph):
+    graph["node_ids"] = np.asarray(graph["node_ids"], dtype=object)
+    graph["node_labels"] = np.asarray(graph["node_labels"], dtype=object)
+    graph["edge_src"] = np.asarray(graph["edge_src"], dtype=np.int64)
+    graph["edge_dst"] = np.asarray(graph["edge_dst"], dtype=np.int64)
+    graph["edge_rels"] = np.asarray(graph["edge_rels"], dtype=object)
+
+    n_nodes = len(graph["node_ids"])
+    order = np.argsort(graph["edge_src"], kind="stable")
+    graph["csr_indices"] = graph["edge_dst"][order]
+    graph["csr_rels"] = graph["edge_rels"][order]
+    counts = np.bincount(graph["edge_src"], minlength=n_nodes)
+    graph["csr_indptr"] = np.concatenate(([0], np.cumsum(counts)))
+
+# Materialize individual records as slotted views when callers want an
+# object rather than raw columns
+def iter_nodes(graph):
+    for node_id, label, properties in zip(
+        graph["node_ids"], graph["node_labels"], graph["node_properties"]
+    ):
+        yield Node(node_id, label, properties)
+
+def iter_edges(graph):
+    for src, dst, rel in zip(graph["edge_src"], graph["edge_dst"], graph["edge_rels"]):
+        yield Edge(graph["node_ids"][src], graph["node_ids"][dst], rel)
+
+# Neighbor query: O(deg(v)) slice of the CSR arrays — no edge-list scan
+def neighbors(graph, node_id):
+    v = graph["id_to_idx"][node_id]
+    start, stop = graph["csr_indptr"][v], graph["csr_indptr"][v + 1]
+    return graph["node_ids"][graph["csr_indices"][start:stop]]
 
 # Add nodes to the knowledge graph
 add_node(knowledge_graph, "1", "Person", {"name": "John Doe", "age": 30})
@@ -33,11 +98,15 @@ add_edge(knowledge_graph, "1", "3", "WATCHED")
 add_edge(knowledge_graph, "2", "4", "WATCHED")
 add_edge(knowledge_graph, "1", "2", "FRIEND")
 
+finalize(knowledge_graph)
+
 # Print the knowledge graph
 print("Knowledge Graph Nodes:")
-for node in knowledge_graph["nodes"]:
-    print(f"ID: {node['id']}, Label: {node['label']}, Properties: {node['properties']}")
+for node in iter_nodes(knowledge_graph):
+    print(f"ID: {node.id}, Label: {node.label}, Properties: {node.properties}")
 
 print("\nKnowledge Graph Edges:")
-for edge in knowledge_graph["edges"]:
-    print(f"Source: {edge['source']}, Target: {edge['target']}, Relationship: {edge['relationship']}")
+for edge in iter_edges(knowledge_graph):
+    print(f"Source: {edge.source}, Target: {edge.target}, Relationship: {edge.relationship}")
+
+print("\nNeighbors of node 1:", list(neighbors(knowledge_graph, "1")))
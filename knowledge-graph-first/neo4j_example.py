@@ -37,18 +37,37 @@ def clear_database():
 
 # Seed the database with nodes and relationships
 def seed_database():
-    # Create Person nodes
-    john = Person(name="John Doe", age=30).save()
-    jane = Person(name="Jane Smith", age=25).save()
-
-    # Create Movie nodes
-    matrix = Movie(title="The Matrix", year=1999).save()
-    inception = Movie(title="Inception", year=2010).save()
-
-    # Create relationships
-    john.watched.connect(matrix, {'rating': 5})
-    jane.watched.connect(inception, {'rating': 4})
-    john.watched.connect(inception, {'rating': 3})
+    # One UNWIND query per entity kind instead of a .save()/.connect() per
+    # node and edge — each ORM call crosses the bolt boundary, so bulk
+    # params collapse O(nodes + edges) roundtrips into one.
+    query = """
+    UNWIND $persons AS person
+    MERGE (p:Person {name: person.name, age: person.age})
+    WITH DISTINCT 1 AS _
+    UNWIND $movies AS movie
+    MERGE (m:Movie {title: movie.title, year: movie.year})
+    WITH DISTINCT 1 AS _
+    UNWIND $edges AS edge
+    MATCH (p:Person {name: edge.person}), (m:Movie {title: edge.movie})
+    MERGE (p)-[r:WATCHED]->(m)
+    SET r.rating = edge.rating
+    """
+    params = {
+        "persons": [
+            {"name": "John Doe", "age": 30},
+            {"name": "Jane Smith", "age": 25},
+        ],
+        "movies": [
+            {"title": "The Matrix", "year": 1999},
+            {"title": "Inception", "year": 2010},
+        ],
+        "edges": [
+            {"person": "John Doe", "movie": "The Matrix", "rating": 5},
+            {"person": "Jane Smith", "movie": "Inception", "rating": 4},
+            {"person": "John Doe", "movie": "Inception", "rating": 3},
+        ],
+    }
+    db.cypher_query(query, params)
 
     print("Database seeded with sample data.")
 
@@ -103,19 +122,10 @@ def add_person_with_four_star_ratings(name, age, movie_titles):
 
 # Query the database
 def query_database():
-    # Query all persons who watched a movie
-    for person in Person.nodes:
-        for movie in person.watched:
-            print(f"{person.name} watched {movie.title} with rating {person.watched.relationship(movie).rating}")
-    print()
-
-    # Query specific person details
-    john = Person.nodes.get(name="John Doe")
-    print(f"\nDetails of {john.name}:")
-    for movie in john.watched:
-        rel = john.watched.relationship(movie)
-        print(f"- Watched {movie.title} ({movie.year}) with rating {rel.rating}")
-    print()
+    # NOTE: avoid `for person in Person.nodes: for movie in person.watched: ...`
+    # — each `.relationship()` lookup issues its own Cypher query (N+1 over
+    # bolt). The single aggregation queries below return the same data in
+    # one roundtrip each.
 
     # Retrieve All Persons and Their Movies Watched
     print("Retrieve All Persons and Their Movies Watched")
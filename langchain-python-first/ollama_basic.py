@@ -2,18 +2,17 @@
 https://python.langchain.com/v0.1/docs/get_started/quickstart/#llm-chain
 """
 
-from langchain_ollama import OllamaLLM
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
-from utils import log_execution_duration
+from utils import get_llm, log_execution_duration
 
 #==================
 #  CONSTANTS
 #==================
-# LLM Model
+# LLM Model (Ollama by default; USE_VLLM=1 for vLLM continuous batching)
 MODEL_NAME = "llama3"
-llm = OllamaLLM(model=MODEL_NAME)
+llm = get_llm(MODEL_NAME)
 
 # Prompt
 prompt = ChatPromptTemplate.from_messages([
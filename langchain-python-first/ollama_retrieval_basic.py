@@ -2,22 +2,25 @@
 https://python.langchain.com/v0.1/docs/get_started/quickstart/#retrieval-chain
 """
 
+import asyncio
+from pathlib import Path
+
 from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_community.document_loaders import WebBaseLoader
 from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_ollama import OllamaLLM, OllamaEmbeddings
+from langchain_ollama import OllamaEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from utils import log_execution_duration
+from utils import get_llm, log_execution_duration
 
 #==================
 #  CONSTANTS
 #==================
-# LLM Model
+# LLM Model (Ollama by default; USE_VLLM=1 for vLLM continuous batching)
 MODEL_NAME = "llama3"
-llm = OllamaLLM(model=MODEL_NAME)
+llm = get_llm(MODEL_NAME)
 embeddings = OllamaEmbeddings(model=MODEL_NAME)
 
 # Prompt
@@ -32,15 +35,43 @@ Question: {input}""")
 #==================
 #  SETUP
 #==================
+# Persist the FAISS index (same PERSIST_DIR pattern as the llamaindex
+# scripts): without it every run re-downloads the page, re-chunks it, and
+# re-embeds every chunk through Ollama — one HTTP roundtrip per chunk.
+PERSIST_DIR = Path(__file__).parent / "faiss_langsmith"
+
+async def _embed_documents(texts: list[str], batch_size: int = 32) -> list[list[float]]:
+    # FAISS.from_documents embeds chunks serially — one blocking Ollama HTTP
+    # roundtrip per chunk. Fan batches out with the async embeddings API,
+    # bounded by a semaphore so the server isn't flooded.
+    sem = asyncio.Semaphore(4)
+
+    async def embed_batch(batch: list[str]) -> list[list[float]]:
+        async with sem:
+            return await embeddings.aembed_documents(batch)
+
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    results = await asyncio.gather(*(embed_batch(b) for b in batches))
+    return [vec for batch in results for vec in batch]
 
-# load online data
-loader = WebBaseLoader("https://docs.smith.langchain.com/user_guide")  # requires "beautifulsoup4"
-docs = loader.load()
+if PERSIST_DIR.exists():
+    vector = FAISS.load_local(str(PERSIST_DIR), embeddings, allow_dangerous_deserialization=True)
+else:
+    # load online data
+    loader = WebBaseLoader("https://docs.smith.langchain.com/user_guide")  # requires "beautifulsoup4"
+    docs = loader.load()
 
-# store documents in Vector Store
-text_splitter = RecursiveCharacterTextSplitter()
-documents = text_splitter.split_documents(docs)
-vector = FAISS.from_documents(documents, embeddings)
+    # store documents in Vector Store, embedding chunks concurrently
+    text_splitter = RecursiveCharacterTextSplitter()
+    documents = text_splitter.split_documents(docs)
+    texts = [d.page_content for d in documents]
+    vectors = asyncio.run(_embed_documents(texts))
+    vector = FAISS.from_embeddings(
+        list(zip(texts, vectors)),
+        embeddings,
+        metadatas=[d.metadata for d in documents],
+    )
+    vector.save_local(str(PERSIST_DIR))
 
 #==================
 #  MAIN
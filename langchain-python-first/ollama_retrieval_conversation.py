@@ -2,23 +2,25 @@
 https://python.langchain.com/v0.1/docs/get_started/quickstart/#conversation-retrieval-chain
 """
 
+from pathlib import Path
+
 from langchain.chains import create_history_aware_retriever, create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_community.document_loaders import WebBaseLoader
 from langchain_community.vectorstores import FAISS
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_ollama import OllamaEmbeddings, OllamaLLM
+from langchain_ollama import OllamaEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from utils import log_execution_duration
+from utils import get_llm, log_execution_duration
 
 #==================
 #  CONSTANTS
 #==================
-# LLM Model
+# LLM Model (Ollama by default; USE_VLLM=1 for vLLM continuous batching)
 MODEL_NAME = "llama3"
-llm = OllamaLLM(model=MODEL_NAME)
+llm = get_llm(MODEL_NAME)
 embeddings = OllamaEmbeddings(model=MODEL_NAME)
 
 # Prompt
@@ -36,15 +38,22 @@ prompt = ChatPromptTemplate.from_messages([
 #==================
 #  SETUP
 #==================
+# Persisted FAISS index: skip the re-download/re-chunk/re-embed cycle on
+# every startup (shared with ollama_retrieval_basic.py).
+PERSIST_DIR = Path(__file__).parent / "faiss_langsmith"
 
-# load online data
-loader = WebBaseLoader("https://docs.smith.langchain.com/user_guide")  # requires "beautifulsoup4"
-docs = loader.load()
+if PERSIST_DIR.exists():
+    vector = FAISS.load_local(str(PERSIST_DIR), embeddings, allow_dangerous_deserialization=True)
+else:
+    # load online data
+    loader = WebBaseLoader("https://docs.smith.langchain.com/user_guide")  # requires "beautifulsoup4"
+    docs = loader.load()
 
-# store documents in Vector Store
-text_splitter = RecursiveCharacterTextSplitter()
-documents = text_splitter.split_documents(docs)
-vector = FAISS.from_documents(documents, embeddings)
+    # store documents in Vector Store
+    text_splitter = RecursiveCharacterTextSplitter()
+    documents = text_splitter.split_documents(docs)
+    vector = FAISS.from_documents(documents, embeddings)
+    vector.save_local(str(PERSIST_DIR))
 
 #==================
 #  MAIN
@@ -27,7 +27,10 @@ def get_index():
 
 async def main():
     index = get_index()
-    llm = Ollama(model="llama3.1:latest", request_timeout=120.0)
+    # keep_alive keeps the weights resident across runs (no reload cost).
+    # For the gather() fan-out below to actually run in parallel, start the
+    # server with OLLAMA_NUM_PARALLEL=4 — otherwise requests serialize.
+    llm = Ollama(model="llama3.1:latest", request_timeout=120.0, keep_alive="24h")
     query_engine = index.as_query_engine(llm=llm)
 
     queries = [
@@ -29,7 +29,9 @@ def get_index():
 
 def main():
     index = get_index()
-    llm = Ollama(model="llama3.1:latest", request_timeout=120.0)
+    # keep_alive pins the weights in the Ollama server between runs, so
+    # repeat invocations skip the multi-second model reload
+    llm = Ollama(model="llama3.1:latest", request_timeout=120.0, keep_alive="24h")
     query_engine = index.as_query_engine(llm=llm)
     resp = query_engine.query("What is this document about?")
     print(resp)
@@ -4,9 +4,10 @@ import re
 text = """
 """
 
-# Regular expression to extract URLs
-url_pattern = r"https?://[^\s]+"
-url_list = re.findall(url_pattern, text)
+# Regular expression to extract URLs, compiled once at module load so
+# repeated scans skip the pattern-cache lookup re.findall pays per call
+URL_RE = re.compile(r"https?://[^\s]+")
+url_list = URL_RE.findall(text)
 
 # Output the extracted URLs
 print(url_list)
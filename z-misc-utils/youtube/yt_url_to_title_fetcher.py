@@ -5,13 +5,26 @@ Output: Bulleted List of Titles + URLs
 import urllib.request
 import json
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 url_list = []
 
-output_str = ""
+output_lines = []
 error_list = []
 
+# Persistent url -> title cache: reruns (and retries after partial failures)
+# skip the oEmbed roundtrip for every URL already resolved once
+CACHE_PATH = Path(__file__).with_name("yt_title_cache.json")
+try:
+    title_cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+except (OSError, ValueError):
+    title_cache = {}
+
 def get_yt_url(url: str):
+    if url in title_cache:
+        return f"* {title_cache[url]} - {url}\n"
+
     params = {"format": "json", "url": url}
     query_string = urllib.parse.urlencode(params)
     yt_url = f"https://www.youtube.com/oembed?{query_string}"
@@ -19,16 +32,35 @@ def get_yt_url(url: str):
     with urllib.request.urlopen(yt_url) as response:
         response_text = response.read()
         data = json.loads(response_text.decode())
+        title_cache[url] = data["title"]
         return f"* {data['title']} - {url}\n"
 
-for url in url_list:
+def fetch(url: str):
     try:
-        output_str += get_yt_url(url)
+        return get_yt_url(url), None
     except Exception as e:
-        error_list.append(f"{url}: {e}")
+        return None, f"{url}: {e}"
+
+# The oEmbed fetches are independent network calls, so fan them out over a
+# thread pool instead of waiting one roundtrip at a time; ex.map keeps the
+# results in input order.
+# Collect lines in a list and join once at the end: repeated str += copies
+# the whole accumulated buffer on every append (quadratic for long lists)
+# Dedupe before the network fan-out (dict.fromkeys keeps first-seen order):
+# pasted URL lists often repeat entries, and each duplicate is a wasted fetch
+unique_urls = list(dict.fromkeys(url_list))
+
+with ThreadPoolExecutor(max_workers=8) as ex:
+    for line, error in ex.map(fetch, unique_urls):
+        if line is not None:
+            output_lines.append(line)
+        else:
+            error_list.append(error)
+
+CACHE_PATH.write_text(json.dumps(title_cache, ensure_ascii=False, indent=2), encoding="utf-8")
 
 print("**Successful URLs**\n")
-print(output_str)
+print("".join(output_lines))
 
 if error_list:
     print("\n**Failed URLs**\n")